@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import logging
 import sys
 import os
@@ -10,19 +11,31 @@ from src.config import config
 from src.storage_handler import StorageHandler
 from src.youtube_api import YouTubeAPI
 from src.csv_exporter import CSVExporter
+from src.profiler import Profiler
 
 logger = config.setup_logging()
 
 class YouTubeAnalyzer:
     """YouTubeチャンネル分析のメイン処理"""
     
-    def __init__(self):
+    def __init__(self, profile: bool = False):
         self.storage = StorageHandler()
         self.youtube_api = YouTubeAPI()
         self.csv_exporter = CSVExporter()
+        self.profiler: Optional[Profiler] = Profiler(self.storage) if profile else None
     
     def run(self):
         """メイン処理を実行"""
+        if self.profiler is None:
+            self._run()
+            return
+        
+        logger.info("プロファイリングモードで実行します")
+        with self.profiler.profile("run"):
+            self._run()
+    
+    def _run(self):
+        """全チャンネルの処理"""
         logger.info("=== YouTube競合チャンネル分析バッチ処理を開始 ===")
         
         try:
@@ -40,7 +53,7 @@ class YouTubeAnalyzer:
                 logger.info(f"[{i}/{len(urls)}] 処理開始: {url}")
                 
                 try:
-                    self._process_channel(url)
+                    self._run_channel(i, url)
                     success_count += 1
                 except Exception as e:
                     logger.error(f"チャンネル処理エラー: {url}, エラー: {e}")
@@ -53,6 +66,15 @@ class YouTubeAnalyzer:
             logger.error(f"致命的なエラーが発生しました: {e}")
             raise
     
+    def _run_channel(self, index: int, url: str):
+        """チャンネルを処理（プロファイリングモードでは区間を計測）"""
+        if self.profiler is None:
+            self._process_channel(url)
+            return
+        
+        with self.profiler.profile(f"channel{index:03d}", url):
+            self._process_channel(url)
+    
     def _process_channel(self, url: str):
         """個別のチャンネルを処理"""
         channel_info = self.youtube_api.get_channel_info(url)
@@ -73,14 +95,27 @@ class YouTubeAnalyzer:
             return
         
         csv_content = self.csv_exporter.export_channel_data(channel_info, videos)
+        if self.profiler is not None:
+            self.profiler.checkpoint("CSV生成後")
         
         file_path = self.storage.save_csv(channel_info['title'], csv_content)
         logger.info(f"保存完了: {file_path}")
 
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="YouTube競合チャンネル分析バッチ")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="cProfile/tracemallocのレポートを出力する（環境変数PROFILE_MODEでも有効化可能）"
+    )
+    return parser.parse_args(argv)
+
 def main():
     """エントリーポイント"""
+    args = parse_args()
     try:
-        analyzer = YouTubeAnalyzer()
+        analyzer = YouTubeAnalyzer(profile=args.profile or config.PROFILE_MODE)
         analyzer.run()
     except KeyboardInterrupt:
         logger.info("処理が中断されました")
@@ -12,6 +12,8 @@ class Config:
     def __init__(self):
         self.LOCAL_MODE = os.getenv("LOCAL_MODE", "True").lower() == "true"
         self.YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+        self.PROFILE_MODE = os.getenv("PROFILE_MODE", "False").lower() == "true"
+        self.PROFILE_TOP_N = self._get_int_env("PROFILE_TOP_N", 30)
         
         if not self.LOCAL_MODE:
             self.GCP_PROJECT_ID = os.getenv("GCP_PROJECT_ID")
@@ -26,6 +28,19 @@ class Config:
             input_dir = self.LOCAL_INPUT_PATH.parent
             input_dir.mkdir(parents=True, exist_ok=True)
     
+    def _get_int_env(self, name: str, default: int) -> int:
+        """整数の環境変数を取得（不正な値の場合はデフォルト値を使用）"""
+        value = os.getenv(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            logging.getLogger(__name__).warning(
+                f"環境変数{name}の値が不正です: {value}（デフォルト値{default}を使用）"
+            )
+            return default
+    
     def get_youtube_api_key(self) -> Optional[str]:
         """YouTube APIキーを取得"""
         if self.LOCAL_MODE:
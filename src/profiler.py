@@ -0,0 +1,239 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+class _Section:
+    """プロファイリング中の区間の状態（Profiler.profileが返すコンテキストマネージャ）"""
+
+    def __init__(self, profiler: "Profiler", label: str, description: str):
+        self.profiler = profiler
+        self.label = label
+        self.description = description
+        self.parent: Optional["_Section"] = None
+        self.started_tracing = False
+        self.base_stats: Dict[tracemalloc.Traceback, tracemalloc.Statistic] = {}
+        # この区間と親区間が保持している開始時の集計結果のメモリ量
+        self.held_memory = 0
+        self.checkpoint: Optional[Tuple[str, int, List[tracemalloc.StatisticDiff]]] = None
+        self.profile = cProfile.Profile()
+        self.child_profiles: List[cProfile.Profile] = []
+        self.peak = 0
+        self.overhead = 0.0
+        self.setup_start = 0.0
+        self.start_time = 0.0
+
+    def __enter__(self) -> "_Section":
+        self.profiler._start_section(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.profiler._finish_section(self)
+
+class Profiler:
+    """cProfile/tracemallocで処理区間を計測し、レポートをストレージに保存"""
+
+    # メモリ確保箇所から除外するプロファイラ関連のファイル
+    _NOISE_FILES = [__file__, tracemalloc.__file__, cProfile.__file__, pstats.__file__]
+
+    def __init__(self, storage, top_n: Optional[int] = None):
+        self.storage = storage
+        self.top_n = top_n if top_n is not None else config.PROFILE_TOP_N
+        self.run_id = datetime.now().strftime('%H%M%S')
+        self._stack: List[_Section] = []
+        self._noise_files = {self._normalize_path(path) for path in self._NOISE_FILES}
+        self._profiler_file = self._normalize_path(__file__)
+
+    def profile(self, label: str, description: str = "") -> _Section:
+        """区間を計測し、終了時にレポートを保存する（入れ子の呼び出しに対応）"""
+        return _Section(self, label, description)
+
+    def checkpoint(self, name: str = "checkpoint") -> None:
+        """処理中のデータが生存している時点のメモリ確保状況を記録（区間外では何もしない）"""
+        if not self._stack:
+            return
+
+        section = self._stack[-1]
+        section.profile.disable()
+        checkpoint_start = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        current -= section.held_memory
+        section.peak = max(section.peak, peak - section.held_memory)
+        if section.checkpoint is None or current >= section.checkpoint[1]:
+            section.checkpoint = (name, current, self._compare_to_base(section))
+            # 集計処理自体のメモリをピークに含めない
+            tracemalloc.reset_peak()
+        section.overhead += time.perf_counter() - checkpoint_start
+        section.profile.enable()
+
+    def _start_section(self, section: _Section) -> None:
+        """区間の計測を開始"""
+        section.setup_start = time.perf_counter()
+        parent = self._stack[-1] if self._stack else None
+        if parent:
+            # cProfileは同時に1つしか有効にできないため、子区間の間は親を止めて後で統計を合算する
+            parent.profile.disable()
+            parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1] - parent.held_memory)
+        section.parent = parent
+
+        section.started_tracing = not tracemalloc.is_tracing()
+        if section.started_tracing:
+            tracemalloc.start()
+
+        memory_before = tracemalloc.get_traced_memory()[0]
+        section.base_stats = self._group_by_line()
+        section.held_memory = (
+            (parent.held_memory if parent else 0)
+            + tracemalloc.get_traced_memory()[0] - memory_before
+        )
+        tracemalloc.reset_peak()
+
+        self._stack.append(section)
+        section.start_time = time.perf_counter()
+        section.profile.enable()
+
+    def _finish_section(self, section: _Section) -> None:
+        """区間の計測を終了し、レポートを保存"""
+        section.profile.disable()
+        end_time = time.perf_counter()
+        elapsed = end_time - section.start_time - section.overhead
+        current, peak = tracemalloc.get_traced_memory()
+        current -= section.held_memory
+        section.peak = max(section.peak, peak - section.held_memory)
+        retained_diffs = self._compare_to_base(section)
+        section.base_stats = {}
+        self._stack.pop()
+
+        if section.started_tracing:
+            tracemalloc.stop()
+
+        report = self._build_report(section, retained_diffs, elapsed, current)
+        filename = f"profile_{self.run_id}_{section.label}.txt"
+        try:
+            self.storage.save_profile_report(filename, report)
+        except Exception as e:
+            logger.warning(f"プロファイリングレポートの保存に失敗しました: {filename}, エラー: {e}")
+
+        parent = section.parent
+        if parent:
+            parent.child_profiles.append(section.profile)
+            parent.child_profiles.extend(section.child_profiles)
+            parent.peak = max(parent.peak, section.peak)
+            # 子区間の計測・レポート保存にかかった時間とメモリは親に含めない
+            parent.overhead += (
+                (section.start_time - section.setup_start)
+                + (time.perf_counter() - end_time)
+                + section.overhead
+            )
+            tracemalloc.reset_peak()
+            parent.profile.enable()
+
+    def _group_by_line(self) -> Dict[tracemalloc.Traceback, tracemalloc.Statistic]:
+        """現在のメモリ確保状況を行単位で集計（スナップショット自体は保持しない）"""
+        return {stat.traceback: stat for stat in tracemalloc.take_snapshot().statistics('lineno')}
+
+    def _compare_to_base(self, section: _Section) -> List[tracemalloc.StatisticDiff]:
+        """区間開始時との差分からプロファイラ自身の確保箇所を除いた上位を取得"""
+        stats = self._group_by_line()
+        diffs = []
+        for traceback in stats.keys() | section.base_stats.keys():
+            if self._normalize_path(traceback[0].filename) in self._noise_files:
+                continue
+            stat = stats.get(traceback)
+            base = section.base_stats.get(traceback)
+            size = stat.size if stat else 0
+            count = stat.count if stat else 0
+            diffs.append(tracemalloc.StatisticDiff(
+                traceback, size, size - (base.size if base else 0),
+                count, count - (base.count if base else 0),
+            ))
+        # Snapshot.compare_toと同じ順序（増加量の大きい順）
+        diffs.sort(reverse=True, key=lambda diff: (
+            abs(diff.size_diff), diff.size, abs(diff.count_diff), diff.count, diff.traceback,
+        ))
+        return diffs[:self.top_n]
+
+    def _normalize_path(self, path: str) -> str:
+        """パスを比較用に正規化"""
+        return os.path.normcase(os.path.abspath(path))
+
+    def _is_noise(self, func: Tuple[str, int, str]) -> bool:
+        """プロファイラ自身の呼び出しかどうかを判定"""
+        filename, _, name = func
+        if "_lsprof.Profiler" in name:
+            return True
+        return self._normalize_path(filename) == self._profiler_file
+
+    def _create_stats(self, section: _Section, stream: io.StringIO) -> pstats.Stats:
+        """子区間を合算し、プロファイラ自身の呼び出しを除いた統計を作成"""
+        stats = pstats.Stats(section.profile, *section.child_profiles, stream=stream)
+        stats.stats = {
+            func: (cc, nc, tt, ct, {
+                caller: value for caller, value in callers.items() if not self._is_noise(caller)
+            })
+            for func, (cc, nc, tt, ct, callers) in stats.stats.items()
+            if not self._is_noise(func)
+        }
+        stats.total_calls = sum(nc for _, nc, _, _, _ in stats.stats.values())
+        stats.prim_calls = sum(cc for cc, _, _, _, _ in stats.stats.values())
+        stats.total_tt = sum(tt for _, _, tt, _, _ in stats.stats.values())
+        return stats
+
+    def _build_report(self, section: _Section, retained_diffs: List[tracemalloc.StatisticDiff],
+                      elapsed: float, current_memory: int) -> str:
+        """計測結果をテキストレポートに整形"""
+        lines = [
+            f"=== プロファイリングレポート: {section.label} ===",
+        ]
+        if section.description:
+            lines.append(f"対象: {section.description}")
+        lines.extend([
+            f"実行時間: {elapsed:.3f}秒",
+            f"プロファイリングのオーバーヘッド（実行時間から除外）: {section.overhead:.3f}秒",
+            f"メモリ使用量（終了時）: {current_memory / 1024 / 1024:.2f} MiB",
+            f"メモリ使用量（ピーク）: {section.peak / 1024 / 1024:.2f} MiB",
+            "※メモリ使用量はプロファイラが保持する集計結果の分を除いた値",
+            "",
+        ])
+
+        stream = io.StringIO()
+        stats = self._create_stats(section, stream)
+        if section.child_profiles:
+            # 子区間の計測中は親のcProfileを止めるため、外側の関数の累積時間は最初の子区間の開始までしか計上されない
+            lines.extend([
+                f"--- 内部時間（tottime）の上位{self.top_n}関数 ---",
+                "※子区間を含むため、runなど外側の関数のcumtimeは最初の子区間の開始までの値です",
+            ])
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top_n)
+        else:
+            lines.append(f"--- 累積時間の上位{self.top_n}関数 ---")
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        lines.append(stream.getvalue().strip())
+
+        if section.checkpoint:
+            name, checkpoint_memory, checkpoint_diffs = section.checkpoint
+            lines.extend([
+                "",
+                f"--- メモリ確保箇所の上位{self.top_n}件"
+                f"（{name}時点: {checkpoint_memory / 1024 / 1024:.2f} MiB、区間開始時との差分） ---",
+            ])
+            for diff in checkpoint_diffs:
+                lines.append(str(diff))
+
+        lines.extend([
+            "",
+            f"--- 区間終了時に残ったメモリの純増分（net retained growth）の上位{self.top_n}箇所 ---",
+        ])
+        for diff in retained_diffs:
+            lines.append(str(diff))
+
+        return "\n".join(lines) + "\n"
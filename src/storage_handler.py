@@ -84,6 +84,29 @@ class StorageHandler:
             logger.info(f"CSVファイルを保存しました: gs://{config.GCS_BUCKET_NAME}/{blob_path}")
             return f"gs://{config.GCS_BUCKET_NAME}/{blob_path}"
     
+    def save_profile_report(self, filename: str, report_content: str) -> str:
+        """プロファイリングレポートを保存"""
+        date_str = datetime.now().strftime('%Y%m%d')
+        filename = self._sanitize_filename(filename)
+
+        if self.local_mode:
+            output_dir = config.LOCAL_OUTPUT_PATH / date_str / "profile"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            file_path = output_dir / filename
+
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(report_content)
+
+            logger.info(f"プロファイリングレポートを保存しました: {file_path}")
+            return str(file_path)
+        else:
+            blob_path = f"output/{date_str}/profile/{filename}"
+            blob = self.bucket.blob(blob_path)
+            blob.upload_from_string(report_content.encode('utf-8'), content_type='text/plain; charset=utf-8')
+
+            logger.info(f"プロファイリングレポートを保存しました: gs://{config.GCS_BUCKET_NAME}/{blob_path}")
+            return f"gs://{config.GCS_BUCKET_NAME}/{blob_path}"
+
     def _sanitize_filename(self, filename: str) -> str:
         """ファイル名として使用できない文字を置換"""
         invalid_chars = {
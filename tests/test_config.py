@@ -0,0 +1,21 @@
+import pytest
+import logging
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config import Config
+
+class TestConfig:
+
+    def test_profile_top_n(self, monkeypatch):
+        monkeypatch.setenv("PROFILE_TOP_N", "10")
+        assert Config().PROFILE_TOP_N == 10
+
+    def test_profile_top_n_invalid_falls_back_to_default(self, monkeypatch, caplog):
+        monkeypatch.setenv("PROFILE_TOP_N", "abc")
+
+        with caplog.at_level(logging.WARNING):
+            assert Config().PROFILE_TOP_N == 30
+
+        assert "PROFILE_TOP_N" in caplog.text
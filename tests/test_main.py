@@ -0,0 +1,86 @@
+import pytest
+import importlib
+from unittest.mock import Mock, patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.profiler import Profiler
+
+@pytest.fixture
+def main():
+    # import時のsetup_loggingでログファイルやハンドラが作られないようにする
+    with patch('src.config.Config.setup_logging'):
+        sys.modules.pop('main', None)
+        module = importlib.import_module('main')
+    yield module
+    sys.modules.pop('main', None)
+
+def _export_channel_data(channel_info, videos):
+    return "\n".join(f"{channel_info['title']},{i}" for i in range(20000))
+
+class TestMain:
+
+    def test_parse_args(self, main):
+        assert main.parse_args(["--profile"]).profile is True
+        assert main.parse_args([]).profile is False
+
+    @pytest.mark.parametrize("argv, profile_mode, expected", [
+        (["main.py"], False, False),
+        (["main.py", "--profile"], False, True),
+        (["main.py"], True, True),
+    ])
+    def test_main_profile_toggle(self, main, argv, profile_mode, expected):
+        with patch.object(main, 'YouTubeAnalyzer') as mock_analyzer, \
+                patch.object(sys, 'argv', argv), \
+                patch.object(main.config, 'PROFILE_MODE', profile_mode):
+            main.main()
+
+        mock_analyzer.assert_called_once_with(profile=expected)
+        mock_analyzer.return_value.run.assert_called_once()
+
+    def test_analyzer_without_profile(self, main):
+        with patch.object(main, 'Profiler') as mock_profiler, \
+                patch.object(main, 'CSVExporter'), \
+                patch.object(main, 'YouTubeAPI'), \
+                patch.object(main, 'StorageHandler') as mock_storage:
+            mock_storage.return_value.read_url_list.return_value = ["https://www.youtube.com/@test"]
+            analyzer = main.YouTubeAnalyzer(profile=False)
+
+        with patch.object(analyzer, '_process_channel') as mock_process:
+            analyzer.run()
+
+        assert analyzer.profiler is None
+        mock_profiler.assert_not_called()
+        mock_process.assert_called_once_with("https://www.youtube.com/@test")
+
+    def test_analyzer_with_profile(self, main):
+        with patch.object(main, 'CSVExporter') as mock_exporter, \
+                patch.object(main, 'YouTubeAPI') as mock_api, \
+                patch.object(main, 'StorageHandler') as mock_storage:
+            analyzer = main.YouTubeAnalyzer(profile=True)
+
+        storage = mock_storage.return_value
+        storage.read_url_list.return_value = ["https://www.youtube.com/@test"]
+        storage.save_csv = lambda channel_name, csv_content: "output/test.csv"
+        mock_api.return_value.get_channel_info.return_value = {
+            'title': 'Test Channel',
+            'uploads_playlist_id': 'UU1234567890',
+        }
+        mock_api.return_value.get_all_video_ids.return_value = ["video1"]
+        mock_api.return_value.get_videos_details.return_value = [{'title': 'Test Video'}]
+        mock_exporter.return_value.export_channel_data.side_effect = _export_channel_data
+
+        analyzer.run()
+
+        assert isinstance(analyzer.profiler, Profiler)
+        reports = {
+            call[0][0]: call[0][1] for call in storage.save_profile_report.call_args_list
+        }
+        run_id = analyzer.profiler.run_id
+        assert set(reports) == {f"profile_{run_id}_channel001.txt", f"profile_{run_id}_run.txt"}
+
+        channel_report = reports[f"profile_{run_id}_channel001.txt"]
+        assert "https://www.youtube.com/@test" in channel_report
+        checkpoint = channel_report.split("CSV生成後時点")[1].splitlines()[1]
+        assert f"test_main.py:{_export_channel_data.__code__.co_firstlineno + 1}:" in checkpoint
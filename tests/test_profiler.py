@@ -0,0 +1,229 @@
+import pytest
+import time
+import tracemalloc
+from contextlib import contextmanager
+from unittest.mock import Mock
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.profiler import Profiler
+
+PROFILER_PATH = os.path.join("src", "profiler.py")
+
+def _allocate():
+    return [str(i) * 10 for i in range(10000)]
+
+def _busy(count):
+    i = 0
+    while i < count:
+        i += 1
+
+def _driver(profiler):
+    for label in ["channel001", "channel002"]:
+        with profiler.profile(label):
+            _busy(1000000)
+
+@contextmanager
+def _app_context():
+    yield _allocate()
+
+def _find_stats_row(report, function_name):
+    """cProfileの出力から関数の行を取得"""
+    for line in report.splitlines():
+        if line.rstrip().endswith(f"({function_name})"):
+            return line.split()
+    raise AssertionError(f"{function_name} not found in report")
+
+def _split_report(report):
+    """レポートを累積時間・checkpoint・純増分のセクションに分割"""
+    sections = {}
+    current = None
+    for line in report.splitlines():
+        if line.startswith("--- 累積時間") or line.startswith("--- 内部時間"):
+            current = "functions"
+        elif line.startswith("--- メモリ確保箇所"):
+            current = "checkpoint"
+        elif line.startswith("--- 区間終了時"):
+            current = "retained"
+        elif current:
+            sections.setdefault(current, []).append(line)
+    return {key: "\n".join(lines) for key, lines in sections.items()}
+
+class TestProfiler:
+
+    def test_profile_saves_report(self):
+        storage = Mock()
+        profiler = Profiler(storage, top_n=5)
+
+        with profiler.profile("run", "test run"):
+            _allocate()
+
+        storage.save_profile_report.assert_called_once()
+        filename, report = storage.save_profile_report.call_args[0]
+        assert filename == f"profile_{profiler.run_id}_run.txt"
+        assert "test run" in report
+        assert "_allocate" in report
+        assert "net retained growth" in report
+        assert not tracemalloc.is_tracing()
+
+    def test_nested_profile_merges_child_stats(self):
+        storage = Mock()
+        profiler = Profiler(storage, top_n=10)
+
+        with profiler.profile("run"):
+            with profiler.profile("channel001"):
+                _allocate()
+
+        assert storage.save_profile_report.call_count == 2
+        (child_name, child_report), (parent_name, parent_report) = [
+            call[0] for call in storage.save_profile_report.call_args_list
+        ]
+        assert child_name.endswith("_channel001.txt")
+        assert parent_name.endswith("_run.txt")
+        assert "_allocate" in child_report
+        assert "_allocate" in parent_report
+        assert not tracemalloc.is_tracing()
+
+    def test_checkpoint_captures_live_allocations(self):
+        storage = Mock()
+        profiler = Profiler(storage, top_n=5)
+
+        def process_channel():
+            videos = _allocate()
+            profiler.checkpoint("CSV生成後")
+            return len(videos)
+
+        with profiler.profile("run"):
+            with profiler.profile("channel001"):
+                process_channel()
+            with profiler.profile("channel002"):
+                process_channel()
+
+        allocation_site = f"test_profiler.py:{_allocate.__code__.co_firstlineno + 1}: size="
+        reports = [call[0][1] for call in storage.save_profile_report.call_args_list]
+        for report in reports[:2]:
+            sections = _split_report(report)
+            assert "CSV生成後" in report
+            top_checkpoint_entry = sections["checkpoint"].splitlines()[0]
+            assert allocation_site in top_checkpoint_entry
+            assert "KiB (+" in top_checkpoint_entry
+            for line in sections["retained"].splitlines():
+                if allocation_site in line:
+                    assert "KiB" not in line and "MiB" not in line
+
+    def test_report_excludes_profiler_overhead(self):
+        storage = Mock()
+        profiler = Profiler(storage, top_n=50)
+
+        with profiler.profile("run"):
+            with profiler.profile("channel001"):
+                _allocate()
+                profiler.checkpoint()
+            with profiler.profile("channel002"):
+                _allocate()
+
+        for call in storage.save_profile_report.call_args_list:
+            sections = _split_report(call[0][1])
+            for section in sections.values():
+                assert PROFILER_PATH not in section
+                assert "contextlib.py" not in section
+                assert "fnmatch.py" not in section
+                assert "cProfile.py" not in section
+                assert "pstats.py" not in section
+                assert "_lsprof" not in section
+
+    def test_parent_elapsed_excludes_child_overhead(self):
+        storage = Mock()
+        storage.save_profile_report.side_effect = lambda filename, report: time.sleep(0.2)
+        profiler = Profiler(storage)
+
+        with profiler.profile("run"):
+            with profiler.profile("channel001"):
+                pass
+
+        run_report = storage.save_profile_report.call_args_list[1][0][1]
+        elapsed = float(run_report.split("実行時間: ")[1].split("秒")[0])
+        overhead = float(run_report.split("（実行時間から除外）: ")[1].split("秒")[0])
+        assert overhead >= 0.2
+        assert elapsed < overhead
+
+    def test_run_report_sorted_by_tottime_with_children(self):
+        storage = Mock()
+        profiler = Profiler(storage, top_n=5)
+
+        with profiler.profile("run"):
+            _driver(profiler)
+
+        run_report = storage.save_profile_report.call_args_list[-1][0][1]
+        assert "内部時間（tottime）" in run_report
+        assert "cumtime" in run_report and "最初の子区間" in run_report
+        busy_row = _find_stats_row(run_report, "_busy")
+        driver_row = _find_stats_row(run_report, "_driver")
+        # 外側の関数のcumtimeは最初の子区間の開始までしか計上されないため、子区間の処理時間より小さい
+        assert float(driver_row[3]) < float(busy_row[1])
+        first_row = _split_report(run_report)["functions"].split("filename:lineno(function)")[1].strip().splitlines()[0]
+        assert first_row.rstrip().endswith("(_busy)")
+
+    def test_report_keeps_app_contextmanager(self):
+        storage = Mock()
+        profiler = Profiler(storage, top_n=50)
+
+        with profiler.profile("channel001"):
+            with _app_context():
+                pass
+
+        report = storage.save_profile_report.call_args[0][1]
+        assert "contextlib.py" in _split_report(report)["functions"]
+
+    def test_memory_excludes_profiler_data(self):
+        storage = Mock()
+        profiler = Profiler(storage)
+        kept = []
+
+        with profiler.profile("run"):
+            for label in ["channel001", "channel002"]:
+                with profiler.profile(label):
+                    kept.append(_allocate())
+                    profiler.checkpoint()
+
+        def read_memory(report, name):
+            return float(report.split(f"メモリ使用量（{name}）: ")[1].split(" MiB")[0])
+
+        channel_report, run_report = [
+            storage.save_profile_report.call_args_list[i][0][1] for i in (1, 2)
+        ]
+        tolerance = 0.05
+        assert abs(read_memory(run_report, "終了時") - read_memory(channel_report, "終了時")) <= tolerance
+        assert read_memory(run_report, "ピーク") <= read_memory(channel_report, "ピーク") + tolerance
+
+    def test_checkpoint_outside_section_does_nothing(self):
+        storage = Mock()
+        profiler = Profiler(storage)
+
+        profiler.checkpoint()
+
+        storage.save_profile_report.assert_not_called()
+        assert not tracemalloc.is_tracing()
+
+    def test_profile_saves_report_on_exception(self):
+        storage = Mock()
+        profiler = Profiler(storage)
+
+        with pytest.raises(ValueError):
+            with profiler.profile("channel001"):
+                raise ValueError("error")
+
+        storage.save_profile_report.assert_called_once()
+        assert not tracemalloc.is_tracing()
+
+    def test_save_failure_does_not_raise(self):
+        storage = Mock()
+        storage.save_profile_report.side_effect = Exception("upload failed")
+        profiler = Profiler(storage)
+
+        with profiler.profile("run"):
+            _allocate()
+
+        storage.save_profile_report.assert_called_once()
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,23 @@
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.storage_handler import StorageHandler
+
+class TestStorageHandler:
+
+    @patch('src.storage_handler.config')
+    def test_save_profile_report_local(self, mock_config, tmp_path):
+        mock_config.LOCAL_MODE = True
+        mock_config.LOCAL_OUTPUT_PATH = tmp_path
+        handler = StorageHandler()
+
+        file_path = handler.save_profile_report("profile_120000_channel001.txt", "レポート内容\n")
+
+        date_str = datetime.now().strftime('%Y%m%d')
+        expected_path = tmp_path / date_str / "profile" / "profile_120000_channel001.txt"
+        assert file_path == str(expected_path)
+        assert expected_path.read_text(encoding='utf-8') == "レポート内容\n"